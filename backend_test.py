@@ -10,9 +10,25 @@ import uuid
 from datetime import datetime
 import sys
 import os
+import time
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Get backend URL from environment
-BACKEND_URL = "https://propexplorer.preview.emergentagent.com/api"
+BACKEND_URL = os.environ.get("BACKEND_URL", "https://propexplorer.preview.emergentagent.com/api")
+
+# Load mode settings (public flood vs. admin probe)
+LOAD_DURATION_SECONDS = 20
+LOAD_PUBLIC_WORKERS = 32
+LOAD_ADMIN_PROBE_INTERVAL = 0.25
+LOAD_ADMIN_P99_FACTOR = 2.0
+LOAD_ADMIN_P99_SLACK_MS = 250
+LOAD_FAST_REJECT_MS = 500
+LOAD_REQUEST_TIMEOUT_SECONDS = 10
+LOAD_BASELINE_SAMPLES = 20
+LOAD_PUBLIC_P99_MS = 2000
+LOAD_MAX_PUBLIC_FAILURE_RATE = 0.01
 
 class RealEstateBackendTester:
     def __init__(self):
@@ -606,6 +622,185 @@ class RealEstateBackendTester:
                 
         # Note: Blog posts don't have delete endpoint in current implementation
         
+    def _percentile(self, samples, pct):
+        """Return the pct-th percentile (nearest rank) of latency samples"""
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        index = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+        return ordered[min(index, len(ordered) - 1)]
+
+    def _probe_admin(self, samples, errors):
+        """Time one authenticated admin request, recording latency in ms"""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}/admin/blog", timeout=LOAD_REQUEST_TIMEOUT_SECONDS)
+            elapsed = (time.perf_counter() - start) * 1000
+            if response.status_code == 200:
+                samples.append(elapsed)
+            else:
+                errors.append(response.status_code)
+        except requests.exceptions.Timeout:
+            # A stalled admin lane must count against p99, not vanish from it
+            samples.append(LOAD_REQUEST_TIMEOUT_SECONDS * 1000)
+            errors.append("timeout")
+        except Exception as e:
+            errors.append(str(e))
+
+    def _flood_public(self, stop_event, stats, lock):
+        """Hammer public list endpoints until stop_event is set"""
+        session = requests.Session()
+        endpoints = ["/properties", "/blog"]
+        i = 0
+        while not stop_event.is_set():
+            endpoint = endpoints[i % len(endpoints)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                response = session.get(f"{self.base_url}{endpoint}", timeout=LOAD_REQUEST_TIMEOUT_SECONDS)
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    stats["total"] += 1
+                    stats["latencies"].append(elapsed)
+                    if response.status_code == 429:
+                        stats["rejected"] += 1
+                        stats["reject_latencies"].append(elapsed)
+                        if "Retry-After" not in response.headers:
+                            stats["missing_retry_after"] += 1
+                    elif response.status_code == 200:
+                        stats["ok"] += 1
+                    else:
+                        stats["other"] += 1
+            except requests.exceptions.Timeout:
+                with lock:
+                    stats["total"] += 1
+                    stats["errors"] += 1
+                    stats["latencies"].append(LOAD_REQUEST_TIMEOUT_SECONDS * 1000)
+            except Exception:
+                with lock:
+                    stats["total"] += 1
+                    stats["errors"] += 1
+
+    def test_admission_control_load(self):
+        """Test admission control: admin p99 stays stable while public traffic is saturated
+
+        The flood and the admin probe share one client IP, so this expects
+        authenticated admin requests to be charged to their per-token bucket
+        only and to bypass the per-IP bucket (admin priority lane).
+        """
+        self.log("Testing Admission Control Under Load...")
+
+        if not self.admin_token:
+            self.log("❌ Cannot test admission control without admin token", "ERROR")
+            return False
+
+        # Baseline admin latency with no competing traffic
+        baseline, baseline_errors = [], []
+        for _ in range(LOAD_BASELINE_SAMPLES):
+            self._probe_admin(baseline, baseline_errors)
+        if baseline_errors:
+            self.log(f"❌ {len(baseline_errors)}/{LOAD_BASELINE_SAMPLES} admin baseline requests failed: "
+                     f"{baseline_errors[:5]}", "ERROR")
+            return False
+        baseline_p99 = self._percentile(baseline, 99)
+        self.log(f"✅ Admin baseline p50={self._percentile(baseline, 50):.0f}ms p99={baseline_p99:.0f}ms")
+
+        # Saturate public endpoints while probing admin
+        stats = {"total": 0, "ok": 0, "rejected": 0, "other": 0, "errors": 0,
+                 "missing_retry_after": 0, "latencies": [], "reject_latencies": []}
+        lock = threading.Lock()
+        stop_event = threading.Event()
+        loaded, loaded_errors = [], []
+
+        self.log(f"Flooding /properties and /blog with {LOAD_PUBLIC_WORKERS} workers for {LOAD_DURATION_SECONDS}s...")
+        with ThreadPoolExecutor(max_workers=LOAD_PUBLIC_WORKERS) as pool:
+            for _ in range(LOAD_PUBLIC_WORKERS):
+                pool.submit(self._flood_public, stop_event, stats, lock)
+            try:
+                deadline = time.time() + LOAD_DURATION_SECONDS
+                while time.time() < deadline:
+                    self._probe_admin(loaded, loaded_errors)
+                    time.sleep(LOAD_ADMIN_PROBE_INTERVAL)
+            finally:
+                stop_event.set()
+
+        self.log(f"Public requests: {stats['total']} total, {stats['ok']} ok, {stats['rejected']} rejected (429), "
+                 f"{stats['other']} other, {stats['errors']} errors")
+
+        success = True
+
+        # Public traffic must be shed with 429 rather than queued
+        if stats["rejected"] == 0:
+            self.log("❌ Public flood never received 429 - rate limiting not active", "ERROR")
+            success = False
+        else:
+            self.log(f"✅ Public flood shed with 429 ({stats['rejected']} rejections)")
+            if stats["missing_retry_after"]:
+                self.log(f"❌ {stats['missing_retry_after']} 429 responses missing Retry-After header", "ERROR")
+                success = False
+            else:
+                self.log("✅ All 429 responses include Retry-After")
+            reject_p99 = self._percentile(stats["reject_latencies"], 99)
+            if reject_p99 <= LOAD_FAST_REJECT_MS:
+                self.log(f"✅ 429 responses are fast (p99={reject_p99:.0f}ms)")
+            else:
+                self.log(f"❌ 429 responses are slow (p99={reject_p99:.0f}ms > {LOAD_FAST_REJECT_MS}ms)", "ERROR")
+                success = False
+
+        # Public traffic must not queue until timeout or fail outright
+        failed = stats["errors"] + stats["other"]
+        failure_rate = failed / stats["total"] if stats["total"] else 1.0
+        if failure_rate > LOAD_MAX_PUBLIC_FAILURE_RATE:
+            self.log(f"❌ {failed}/{stats['total']} public requests timed out or failed "
+                     f"({failure_rate:.1%} > {LOAD_MAX_PUBLIC_FAILURE_RATE:.0%})", "ERROR")
+            success = False
+        else:
+            self.log(f"✅ Public requests answered without queueing ({failure_rate:.1%} timed out or failed)")
+        public_p99 = self._percentile(stats["latencies"], 99)
+        if public_p99 <= LOAD_PUBLIC_P99_MS:
+            self.log(f"✅ Public p99 latency bounded under flood (p99={public_p99:.0f}ms)")
+        else:
+            self.log(f"❌ Public p99 latency too high under flood (p99={public_p99:.0f}ms > {LOAD_PUBLIC_P99_MS}ms)",
+                     "ERROR")
+            success = False
+
+        # Admin lane must stay available and stable
+        if loaded_errors:
+            self.log(f"❌ {len(loaded_errors)} admin requests failed under load: {loaded_errors[:5]}", "ERROR")
+            success = False
+        if not loaded:
+            self.log("❌ No admin requests succeeded under load", "ERROR")
+            return False
+
+        loaded_p99 = self._percentile(loaded, 99)
+        allowed_p99 = max(baseline_p99 * LOAD_ADMIN_P99_FACTOR, baseline_p99 + LOAD_ADMIN_P99_SLACK_MS)
+        self.log(f"Admin under load p50={self._percentile(loaded, 50):.0f}ms p99={loaded_p99:.0f}ms "
+                 f"(allowed {allowed_p99:.0f}ms)")
+        if loaded_p99 <= allowed_p99:
+            self.log("✅ Admin p99 latency stable while public traffic is saturated")
+        else:
+            self.log("❌ Admin p99 latency degraded under public load", "ERROR")
+            success = False
+
+        return success
+
+    def run_load_tests(self):
+        """Run admission control load tests"""
+        self.log("=" * 60)
+        self.log("STARTING KIMIA ADMISSION CONTROL LOAD TESTS")
+        self.log("=" * 60)
+
+        if self.test_admin_login():
+            result = self.test_admission_control_load()
+        else:
+            self.log("❌ Cannot run load test: admin login failed", "ERROR")
+            result = False
+
+        self.log("=" * 60)
+        self.log(f"ADMISSION_CONTROL_LOAD: {'✅ PASSED' if result else '❌ FAILED'}")
+        self.log("=" * 60)
+        return result
+
     def run_all_tests(self):
         """Run all backend tests"""
         self.log("=" * 60)
@@ -669,5 +864,8 @@ class RealEstateBackendTester:
 
 if __name__ == "__main__":
     tester = RealEstateBackendTester()
-    success = tester.run_all_tests()
+    if "--load" in sys.argv:
+        success = tester.run_load_tests()
+    else:
+        success = tester.run_all_tests()
     sys.exit(0 if success else 1)
\ No newline at end of file